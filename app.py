@@ -1,5 +1,4 @@
 import streamlit as st
-import requests
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -8,6 +7,7 @@ import re
 import os
 from dotenv import load_dotenv
 import time
+from news_sources import NewsAggregator, build_sources, normalize_article
 
 # Load environment variables
 load_dotenv()
@@ -72,34 +72,26 @@ class NewsDigestApp:
         self.api_key = os.getenv('NEWS_API_KEY')
         self.email_user = os.getenv('EMAIL_USER')
         self.email_password = os.getenv('EMAIL_PASSWORD')
+        self.aggregator = NewsAggregator(build_sources(newsdata_api_key=self.api_key))
     
     def fetch_news(self, category='technology', max_results=5):
-        """Fetch news from NewsData.io"""
-        if not self.api_key or self.api_key.startswith('your_'):
-            return None, "❌ Please configure your NewsData.io API key in the .env file"
+        """Fetch news from the configured providers"""
+        articles, errors = self.fetch_categories([category], max_results)
+        return articles[category], errors[category]
+    
+    def fetch_categories(self, categories, max_results=5):
+        """Fetch several categories in parallel; returns (articles, errors)"""
+        if not self.aggregator.sources:
+            message = "❌ Please configure your NewsData.io API key in the .env file"
+            return {category: None for category in categories}, {category: message for category in categories}
         
-        try:
-            url = "https://newsdata.io/api/1/news"
-            params = {
-                'apikey': self.api_key,
-                'category': category,
-                'language': 'en',
-                'size': max_results
-            }
-            
-            response = requests.get(url, params=params, timeout=30)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('status') == 'success':
-                    return data.get('results', []), None
-                else:
-                    return None, data.get('message', 'Unknown API error')
-            else:
-                return None, f"HTTP Error {response.status_code}"
-                
-        except Exception as e:
-            return None, f"Error: {str(e)}"
+        results, errors = self.aggregator.fetch_categories(categories, max_results)
+        
+        # Report every provider error, including ones covered by cached results
+        return results, {
+            category: '; '.join(errors[category]) if errors[category] else None
+            for category in categories
+        }
     
     def simple_summarize(self, text, max_sentences=2):
         """Simple text summarization"""
@@ -140,25 +132,27 @@ class NewsDigestApp:
         
         all_articles = {}
         
-        # Fetch news for each category
-        for i, category in enumerate(categories):
-            status_text.text(f"📡 Fetching {category} news...")
-            articles, error = self.fetch_news(category, articles_per_category)
-            
-            if error:
-                st.warning(f"Could not fetch {category} news: {error}")
+        # Fetch all categories from all providers at once
+        status_text.text(f"📡 Fetching {', '.join(categories)} news...")
+        fetched, errors = self.fetch_categories(categories, articles_per_category)
+        
+        for category in categories:
+            if errors[category] and fetched[category]:
+                st.warning(f"Some {category} sources failed: {errors[category]}")
+                all_articles[category] = fetched[category]
+            elif errors[category]:
+                st.warning(f"Could not fetch {category} news: {errors[category]}")
                 # Add fallback article
-                all_articles[category] = [{
+                all_articles[category] = [normalize_article({
                     'title': f'{category.capitalize()} News Update',
                     'description': f'Latest developments in {category}',
                     'content': f'Stay tuned for the latest {category} news updates.',
-                    'source': 'News Digest Bot',
-                    'url': ''
-                }]
+                    'source': 'News Digest Bot'
+                }, category)]
             else:
-                all_articles[category] = articles or []
-            
-            progress_bar.progress((i + 1) / len(categories) * 0.4)
+                all_articles[category] = fetched[category] or []
+        
+        progress_bar.progress(0.4)
         
         # Process and summarize articles
         status_text.text("📝 Summarizing articles...")
@@ -170,8 +164,7 @@ class NewsDigestApp:
                 summary = self.simple_summarize(
                     f"{article.get('title', '')}. {article.get('description', '')}. {article.get('content', '')}"
                 )
-                article['summary'] = summary
-                summarized_articles.append(article)
+                summarized_articles.append({**article, 'summary': summary})
             processed_articles[category] = summarized_articles
         
         progress_bar.progress(0.8)
@@ -190,7 +183,7 @@ class NewsDigestApp:
             
             for i, article in enumerate(articles, 1):
                 body += f"{i}. {article.get('title', 'No title')}\n"
-                body += f"   📍 Source: {article.get('source_id', article.get('source', 'Unknown'))}\n"
+                body += f"   📍 Source: {article.get('source', 'Unknown')}\n"
                 body += f"   📝 {article.get('summary', article.get('description', ''))}\n"
                 if article.get('url'):
                     body += f"   🔗 Read more: {article.get('url')}\n"
@@ -207,9 +200,14 @@ class NewsDigestApp:
         
         return success, message, processed_articles
 
+@st.cache_resource
+def get_app():
+    """Keep one app (and its news aggregator) across Streamlit reruns"""
+    return NewsDigestApp()
+
 def main():
     # Initialize app
-    app = NewsDigestApp()
+    app = get_app()
     
     # Header
     st.markdown('<h1 class="main-header">📰 Daily News Digest Bot</h1>', unsafe_allow_html=True)
@@ -273,7 +271,7 @@ def main():
                                 <div class="news-card">
                                     <h4>{article.get('title', 'No title')}</h4>
                                     <p>{article.get('summary', article.get('description', ''))}</p>
-                                    <small>Source: {article.get('source_id', article.get('source', 'Unknown'))}</small>
+                                    <small>Source: {article.get('source', 'Unknown')}</small>
                                 </div>
                                 """, unsafe_allow_html=True)
                 else:
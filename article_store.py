@@ -0,0 +1,250 @@
+import hashlib
+import json
+import mmap
+import os
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Iterator, Optional, Union
+
+from config import ARTICLE_STORE_DIR
+from news_sources import article_key
+
+# Fixed-width columns: name -> array typecode
+COLUMNS = {
+    'url_hash': 'Q',   # 64-bit hash of the article URL
+    'published': 'q',  # publish time, seconds since the epoch (UTC); 0 if unknown
+    'offset': 'Q',     # start of the row's text fields in strings.dat
+    'length': 'I'      # size of the row's text fields in strings.dat
+}
+STRINGS_FILE = 'strings.dat'
+UNKNOWN_PUBLISHED = 0
+TEXT_FIELDS = ('title', 'description', 'summary', 'source', 'url', 'category', 'published_at')
+
+
+@dataclass
+class ArticleRecord:
+    """Compact in-memory article"""
+    __slots__ = ('url_hash', 'published') + TEXT_FIELDS
+    url_hash: int
+    published: int
+    title: str
+    description: str
+    summary: str
+    source: str
+    url: str
+    category: str
+    published_at: str
+
+    @classmethod
+    def from_dict(cls, article: Dict) -> 'ArticleRecord':
+        return cls(
+            url_hash=url_hash(article),
+            published=parse_published(article.get('published_at', '')),
+            **{field: str(article.get(field) or '') for field in TEXT_FIELDS}
+        )
+
+    def to_dict(self) -> Dict:
+        return {field: getattr(self, field) for field in TEXT_FIELDS}
+
+
+def url_hash(article: Union[Dict, str]) -> int:
+    """64-bit hash of an article's URL (or title when it has no URL)"""
+    if isinstance(article, str):
+        article = {'url': article}
+    digest = hashlib.blake2b(article_key(article).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def parse_published(value: str) -> int:
+    """Parse NewsData, RSS or Atom dates; returns UNKNOWN_PUBLISHED if unparsable"""
+    value = (value or '').strip()
+    parsed = None
+
+    if value:
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            try:
+                parsed = parsedate_to_datetime(value)
+            except (TypeError, ValueError, IndexError):
+                parsed = None
+
+    if parsed is None:
+        return UNKNOWN_PUBLISHED
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def _to_epoch(value: Union[datetime, int, float, None], default: int) -> int:
+    if value is None:
+        return default
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    return int(value)
+
+
+class ArticleStore:
+    """Append-only article history kept as memory-mapped column files.
+
+    Hashes and publish times live in fixed-width columns that are scanned
+    straight from the mapped files; text fields are only decoded for the
+    rows that are actually returned.
+    """
+
+    def __init__(self, directory: str = ARTICLE_STORE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._maps = {}
+        self._views = {}
+        self._rows = 0
+        self._index: Dict[int, int] = {}
+        self._load()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _load(self):
+        """Repair torn writes, map every file and build the hash index"""
+        sizes = []
+
+        for name, typecode in COLUMNS.items():
+            path = self._path(f"{name}.col")
+            if not os.path.exists(path):
+                open(path, 'wb').close()
+            sizes.append(os.path.getsize(path) // array(typecode).itemsize)
+
+        # A write interrupted halfway leaves some columns longer; drop the partial row
+        self._rows = min(sizes)
+        for name, typecode in COLUMNS.items():
+            path = self._path(f"{name}.col")
+            if os.path.getsize(path) > self._rows * array(typecode).itemsize:
+                os.truncate(path, self._rows * array(typecode).itemsize)
+
+        self._map()
+        self._index = {}
+        for row, value in enumerate(self._views['url_hash'][:self._rows]):
+            self._index.setdefault(value, row)
+
+    def _map(self):
+        """Map the files at their current size.
+
+        Previous mappings are not closed here: scans still iterating over them
+        keep them alive, and they are freed once nothing references them.
+        """
+        maps = {}
+        views = {}
+
+        for name, typecode in list(COLUMNS.items()) + [(STRINGS_FILE, 'B')]:
+            path = self._path(name if name == STRINGS_FILE else f"{name}.col")
+            if not os.path.exists(path) or os.path.getsize(path) == 0:
+                views[name] = memoryview(b'').cast(typecode)
+                continue
+            with open(path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            maps[name] = mapped
+            views[name] = memoryview(mapped).cast(typecode)
+
+        self._maps = maps
+        self._views = views
+
+    def close(self):
+        """Unmap the files; scans still in progress can't continue after this"""
+        for view in self._views.values():
+            view.release()
+        for mapped in self._maps.values():
+            mapped.close()
+        self._views = {}
+        self._maps = {}
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def __contains__(self, article: Union[Dict, str]) -> bool:
+        return url_hash(article) in self._index
+
+    def append_many(self, articles: Iterable[Dict]) -> int:
+        """Append articles not already stored; returns how many were added"""
+        records = []
+        batch_hashes = set()
+        for article in articles:
+            record = ArticleRecord.from_dict(article)
+            if record.url_hash in self._index or record.url_hash in batch_hashes:
+                continue
+            batch_hashes.add(record.url_hash)
+            records.append(record)
+
+        if not records:
+            return 0
+
+        columns = {name: array(typecode) for name, typecode in COLUMNS.items()}
+        chunks = []
+        offset = os.path.getsize(self._path(STRINGS_FILE)) if os.path.exists(self._path(STRINGS_FILE)) else 0
+
+        for record in records:
+            chunk = json.dumps(record.to_dict(), ensure_ascii=False).encode('utf-8')
+            chunks.append(chunk)
+            columns['url_hash'].append(record.url_hash)
+            columns['published'].append(record.published)
+            columns['offset'].append(offset)
+            columns['length'].append(len(chunk))
+            offset += len(chunk)
+
+        # Text first, hashes last: a row only counts once every column has it
+        with open(self._path(STRINGS_FILE), 'ab') as f:
+            f.write(b''.join(chunks))
+        for name in ('length', 'offset', 'published', 'url_hash'):
+            with open(self._path(f"{name}.col"), 'ab') as f:
+                columns[name].tofile(f)
+
+        # Extend the index and mappings for the new rows only
+        for row, record in enumerate(records, self._rows):
+            self._index[record.url_hash] = row
+        self._rows += len(records)
+        self._map()
+        return len(records)
+
+    def append(self, article: Dict) -> bool:
+        return self.append_many([article]) == 1
+
+    def _record(self, row: int, views: Optional[Dict[str, memoryview]] = None) -> ArticleRecord:
+        views = views or self._views
+        offset = views['offset'][row]
+        length = views['length'][row]
+        fields = json.loads(bytes(views[STRINGS_FILE][offset:offset + length]).decode('utf-8'))
+        return ArticleRecord(
+            url_hash=views['url_hash'][row],
+            published=views['published'][row],
+            **{field: fields.get(field, '') for field in TEXT_FIELDS}
+        )
+
+    def get_by_hash(self, value: int) -> Optional[ArticleRecord]:
+        row = self._index.get(value)
+        return self._record(row) if row is not None else None
+
+    def get(self, url: str) -> Optional[ArticleRecord]:
+        """Look up a stored article by URL"""
+        return self.get_by_hash(url_hash(url))
+
+    def scan(self, start: Union[datetime, int, float, None] = None,
+             end: Union[datetime, int, float, None] = None) -> Iterator[ArticleRecord]:
+        """Yield articles published in [start, end), in insertion order.
+
+        Articles with an unknown publish date are stored as UNKNOWN_PUBLISHED
+        and only show up in scans without a start. The scan covers the rows
+        present when it is called; appending while iterating is safe.
+        """
+        start_ts = _to_epoch(start, -2 ** 63)
+        end_ts = _to_epoch(end, 2 ** 63 - 1)
+        return self._scan(self._views, self._rows, start_ts, end_ts)
+
+    def _scan(self, views: Dict[str, memoryview], rows: int,
+              start_ts: int, end_ts: int) -> Iterator[ArticleRecord]:
+        published = views['published']
+        for row in range(rows):
+            if start_ts <= published[row] < end_ts:
+                yield self._record(row, views)
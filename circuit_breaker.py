@@ -0,0 +1,211 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from config import (
+    CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT, CIRCUIT_STATE_FILE,
+    MIN_REQUEST_TIMEOUT, PROVIDER_TIMEOUT
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because its endpoint is known to be down"""
+
+
+class LatencyTracker:
+    """Derives a request timeout from recently observed latencies"""
+
+    def __init__(self, window: int = 50, percentile: float = 0.95, multiplier: float = 2.0,
+                 min_samples: int = 5, min_timeout: float = MIN_REQUEST_TIMEOUT,
+                 max_timeout: float = PROVIDER_TIMEOUT):
+        self.samples = deque(maxlen=window)
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_samples = min_samples
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.samples.append(seconds)
+
+    def to_list(self):
+        with self._lock:
+            return list(self.samples)
+
+    def timeout(self) -> float:
+        """Percentile latency times a safety multiplier, clamped to the allowed range"""
+        with self._lock:
+            if len(self.samples) < self.min_samples:
+                return self.max_timeout
+            ordered = sorted(self.samples)
+
+        index = min(int(len(ordered) * self.percentile), len(ordered) - 1)
+        return max(self.min_timeout, min(self.max_timeout, ordered[index] * self.multiplier))
+
+
+class CircuitBreaker:
+    """Per-endpoint circuit breaker with half-open probing.
+
+    CLOSED: requests flow normally. OPEN: requests are rejected without
+    touching the network until reset_timeout has passed. HALF_OPEN: a single
+    probe request is let through; its outcome closes or re-opens the circuit.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, name: str, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+                 latency: Optional[LatencyTracker] = None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.latency = latency or LatencyTracker()
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Whether a request may be sent now; callers must then record its outcome"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+
+            if self.state == self.OPEN:
+                if time.time() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+
+            # Half-open: only one probe at a time
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self, latency: Optional[float] = None):
+        if latency is not None:
+            self.latency.record(latency)
+
+        with self._lock:
+            if self.state != self.CLOSED:
+                print(f"   ✅ {self.name} recovered - circuit closed")
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def release_probe(self):
+        """Let another probe through after an outcome that says nothing about health"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self, permanent: bool = False, latency: Optional[float] = None):
+        """Count a failure; permanent failures (e.g. bad credentials) trip immediately.
+
+        Pass the timeout as latency when a request timed out, so rising
+        latency raises the adaptive timeout instead of failing forever.
+        """
+        if latency is not None:
+            self.latency.record(latency)
+
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+
+            if self.state == self.HALF_OPEN or permanent or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    print(f"   ⚡ {self.name} is failing - circuit open for {self.reset_timeout:g}s")
+                self.state = self.OPEN
+                self.opened_at = time.time()
+
+    def timeout(self) -> float:
+        """Adaptive timeout for the next request; probes get the full timeout"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                return self.latency.max_timeout
+        return self.latency.timeout()
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            state = {'state': self.state, 'failures': self.failures, 'opened_at': self.opened_at}
+        state['latencies'] = self.latency.to_list()
+        return state
+
+    def restore(self, data: Dict):
+        """Load state saved by an earlier run"""
+        with self._lock:
+            # A probe that was in flight when the process exited never reported back
+            state = data.get('state', self.CLOSED)
+            self.state = self.OPEN if state == self.HALF_OPEN else state
+            self.failures = data.get('failures', 0)
+            self.opened_at = data.get('opened_at', 0.0)
+            self._probe_in_flight = False
+        for seconds in data.get('latencies', []):
+            self.latency.record(seconds)
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+_saved_state: Optional[Dict[str, Dict]] = None
+
+
+def _read_state(path: str) -> Dict[str, Dict]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_json_atomic(path: str, data):
+    """Write JSON through a unique temp file so concurrent writers never mix"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Return the shared breaker for an endpoint, creating it on first use.
+
+    New breakers start from the state saved by save_breakers(), so an
+    endpoint that was down in the last run is skipped straight away.
+    """
+    global _saved_state
+    with _breakers_lock:
+        if name not in _breakers:
+            if _saved_state is None:
+                _saved_state = _read_state(CIRCUIT_STATE_FILE)
+            breaker = CircuitBreaker(name)
+            if name in _saved_state:
+                breaker.restore(_saved_state[name])
+            _breakers[name] = breaker
+        return _breakers[name]
+
+
+def save_breakers(path: str = CIRCUIT_STATE_FILE):
+    """Persist every breaker's state for the next run"""
+    with _breakers_lock:
+        # Keep entries for endpoints this process never touched
+        state = dict(_read_state(path))
+        state.update({name: breaker.to_dict() for name, breaker in _breakers.items()})
+
+    try:
+        write_json_atomic(path, state)
+    except (OSError, TypeError, ValueError) as e:
+        print(f"⚠️  Could not save circuit breaker state: {e}")
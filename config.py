@@ -7,6 +7,36 @@ load_dotenv()
 NEWSDATA_API_KEY = os.getenv('NEWSDATA_API_KEY')
 NEWSDATA_BASE_URL = "https://newsdata.io/api/1/news"
 
+# News providers to query, in priority order (newsdata, rss, local)
+NEWS_SOURCES = [s.strip() for s in os.getenv('NEWS_SOURCES', 'newsdata').split(',') if s.strip()]
+
+# RSS/Atom feeds as comma-separated "category=url" pairs
+RSS_FEEDS = os.getenv('RSS_FEEDS', '')
+
+# Directory with local JSON dumps named <category>.json
+LOCAL_NEWS_DIR = os.getenv('LOCAL_NEWS_DIR', 'news_data')
+
+# Seconds to wait for each provider before giving up on it
+PROVIDER_TIMEOUT = float(os.getenv('PROVIDER_TIMEOUT', 10))
+
+# Circuit breaker: consecutive failures before an endpoint is skipped,
+# and seconds to wait before probing it again
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 3))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv('CIRCUIT_RESET_TIMEOUT', 300))
+
+# Lower bound for latency-based request timeouts
+MIN_REQUEST_TIMEOUT = float(os.getenv('MIN_REQUEST_TIMEOUT', 2))
+
+# Directory for the on-disk article history
+ARTICLE_STORE_DIR = os.getenv('ARTICLE_STORE_DIR', 'article_store')
+
+# Circuit breaker state and last good provider results, kept between runs
+CIRCUIT_STATE_FILE = os.getenv('CIRCUIT_STATE_FILE', os.path.join(ARTICLE_STORE_DIR, 'circuit_state.json'))
+SOURCE_CACHE_FILE = os.getenv('SOURCE_CACHE_FILE', os.path.join(ARTICLE_STORE_DIR, 'source_cache.json'))
+
+# Seconds a provider's cached results may stand in for a failed fetch
+SOURCE_CACHE_MAX_AGE = float(os.getenv('SOURCE_CACHE_MAX_AGE', 24 * 60 * 60))
+
 # Gemini API Configuration
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 
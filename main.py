@@ -1,5 +1,6 @@
 from news_fetcher import NewsFetcher, get_fallback_news
 from summarizer import ArticleSummarizer
+from article_store import ArticleStore
 from email_sender import EmailSender
 from config import CATEGORIES
 import schedule
@@ -15,6 +16,7 @@ class DailyNewsDigestBot:
         self.news_fetcher = NewsFetcher()
         self.summarizer = ArticleSummarizer()
         self.email_sender = EmailSender()
+        self.article_store = ArticleStore()
     
     def run_digest(self, use_fallback=False):
         """Run the complete news digest process"""
@@ -22,18 +24,35 @@ class DailyNewsDigestBot:
         
         try:
             # Step 1: Fetch news
+            using_fallback = use_fallback
+            already_sent = []
             if use_fallback:
                 logging.warning("Using fallback news data (API may be unavailable)")
                 news_by_category = get_fallback_news()
             else:
                 logging.info("Fetching news from all categories...")
-                news_by_category = self.news_fetcher.fetch_all_news()
+                
+                # Skip articles already sent in an earlier digest
+                def sent_before(article):
+                    if article in self.article_store:
+                        already_sent.append(article)
+                        return True
+                    return False
+                
+                news_by_category = self.news_fetcher.fetch_all_news(exclude=sent_before)
             
             # Check if we got any news
             total_articles = sum(len(articles) for articles in news_by_category.values())
+            fetch_errors = [error for errors in self.news_fetcher.last_errors.values() for error in errors]
+            if total_articles == 0 and already_sent and not fetch_errors:
+                logging.info("No new articles since the last digest - nothing to send")
+                return
+            if total_articles == 0 and fetch_errors:
+                logging.error(f"News fetch failed: {'; '.join(fetch_errors)}")
             if total_articles == 0:
                 logging.warning("No articles fetched from API. Trying fallback data...")
                 news_by_category = get_fallback_news()
+                using_fallback = True
                 total_articles = sum(len(articles) for articles in news_by_category.values())
                 
                 if total_articles == 0:
@@ -55,6 +74,11 @@ class DailyNewsDigestBot:
             success = self.email_sender.create_daily_digest(summarized_news)
             
             if success:
+                if not using_fallback:
+                    added = self.article_store.append_many(
+                        article for articles in summarized_news.values() for article in articles
+                    )
+                    logging.info(f"Saved {added} articles to history ({len(self.article_store)} total)")
                 logging.info("Daily digest completed successfully!")
             else:
                 logging.error("Failed to send daily digest")
@@ -1,103 +1,41 @@
-import requests
-from config import NEWSDATA_API_KEY, NEWSDATA_BASE_URL, CATEGORIES, ARTICLES_PER_CATEGORY
-from typing import List, Dict
-import json
+from config import CATEGORIES, ARTICLES_PER_CATEGORY
+from news_sources import NewsAggregator, NewsSource
+from typing import Callable, List, Dict, Optional
 
 class NewsFetcher:
-    def __init__(self):
-        self.api_key = NEWSDATA_API_KEY
-        self.base_url = NEWSDATA_BASE_URL
+    def __init__(self, sources: Optional[List[NewsSource]] = None):
+        self.aggregator = NewsAggregator(sources)
+        # Provider errors from the most recent fetch, by category
+        self.last_errors: Dict[str, List[str]] = {}
         
-        if not self.api_key or self.api_key.startswith('your_'):
-            print("❌ WARNING: Invalid or missing NewsData.io API key")
-            print("💡 Get free key from: https://newsdata.io/pricing")
+        if not self.aggregator.sources:
+            print("❌ WARNING: No news sources configured")
+            print("💡 Get free NewsData.io key from: https://newsdata.io/pricing")
     
     def fetch_news_by_category(self, category: str, max_results: int = 5) -> List[Dict]:
         """Fetch news articles for a specific category"""
-        # Check if API key is valid
-        if not self.api_key or self.api_key.startswith('your_'):
-            print(f"❌ Skipping {category} - Invalid API key")
-            return []
-        
-        try:
-            params = {
-                'apikey': self.api_key,
-                'category': category,
-                'language': 'en',
-                'size': max_results
-            }
-            
-            print(f"   🔗 Requesting {category} news...")
-            response = requests.get(self.base_url, params=params, timeout=30)
-            
-            # Check for specific HTTP errors
-            if response.status_code == 401:
-                print(f"   ❌ 401 Unauthorized for {category} - Check API key")
-                return []
-            elif response.status_code == 429:
-                print(f"   ⚠️  Rate limit exceeded for {category}")
-                return []
-            elif response.status_code != 200:
-                print(f"   ❌ HTTP {response.status_code} for {category}")
-                return []
-                
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if data.get('status') == 'success':
-                articles = data.get('results', [])
-                print(f"   ✅ Found {len(articles)} {category} articles")
-                return self._process_articles(articles)
-            else:
-                error_msg = data.get('message', 'Unknown error')
-                print(f"   ❌ API error for {category}: {error_msg}")
-                return []
-                
-        except requests.exceptions.RequestException as e:
-            print(f"   ❌ Network error for {category}: {e}")
-            return []
-        except json.JSONDecodeError as e:
-            print(f"   ❌ JSON error for {category}: {e}")
-            return []
+        return self.fetch_categories([category], max_results)[category]
     
-    def _process_articles(self, articles: List[Dict]) -> List[Dict]:
-        """Process and clean article data"""
-        processed_articles = []
+    def fetch_categories(self, categories: List[str], max_results: int = 5,
+                         exclude: Optional[Callable[[Dict], bool]] = None) -> Dict[str, List[Dict]]:
+        """Fetch several categories from all providers in parallel, skipping excluded articles"""
+        print(f"   🔗 Requesting {', '.join(categories)} news...")
+        results, errors = self.aggregator.fetch_categories(categories, max_results, exclude)
+        self.last_errors = errors
         
-        for article in articles:
-            # Skip articles without title
-            if not article.get('title'):
-                continue
-                
-            processed_article = {
-                'title': article.get('title', '').strip(),
-                'description': article.get('description', '').strip(),
-                'content': article.get('content', '').strip(),
-                'source': article.get('source_id', 'Unknown'),
-                'url': article.get('link', ''),
-                'published_at': article.get('pubDate', ''),
-                'category': article.get('category', ['general'])[0] if article.get('category') else 'general'
-            }
-            
-            # Limit content length for summarization
-            if len(processed_article['content']) > 1000:
-                processed_article['content'] = processed_article['content'][:1000] + '...'
-            
-            processed_articles.append(processed_article)
+        for category in categories:
+            print(f"\n🎯 {category.capitalize()} News:")
+            for error in errors[category]:
+                print(f"   ❌ {error}")
+            print(f"   ✅ Found {len(results[category])} {category} articles")
         
-        return processed_articles
+        return results
     
-    def fetch_all_news(self) -> Dict[str, List[Dict]]:
+    def fetch_all_news(self, exclude: Optional[Callable[[Dict], bool]] = None) -> Dict[str, List[Dict]]:
         """Fetch news for all categories"""
-        all_news = {}
-        
         print("📡 Fetching news from categories:", ', '.join(CATEGORIES))
         
-        for category in CATEGORIES:
-            print(f"\n🎯 {category.capitalize()} News:")
-            articles = self.fetch_news_by_category(category, ARTICLES_PER_CATEGORY)
-            all_news[category] = articles
+        all_news = self.fetch_categories(CATEGORIES, ARTICLES_PER_CATEGORY, exclude)
         
         total_articles = sum(len(articles) for articles in all_news.values())
         print(f"\n📊 Total articles fetched: {total_articles}")
@@ -0,0 +1,496 @@
+import json
+import os
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, List, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+import requests
+
+from circuit_breaker import CircuitOpenError, get_breaker, save_breakers, write_json_atomic
+from config import (
+    NEWSDATA_API_KEY, NEWSDATA_BASE_URL, NEWS_SOURCES, RSS_FEEDS,
+    LOCAL_NEWS_DIR, PROVIDER_TIMEOUT, SOURCE_CACHE_FILE, SOURCE_CACHE_MAX_AGE
+)
+
+MAX_CONTENT_LENGTH = 1000
+NEWSDATA_MAX_PAGE_SIZE = 10
+# How many more articles to request when some will be filtered out
+EXCLUDE_OVERFETCH = 3
+ATOM_NS = '{http://www.w3.org/2005/Atom}'
+# Share of an RSS job's timeout its feeds may use, leaving time to return partial results
+FEED_DEADLINE_FRACTION = 0.8
+TRACKING_PARAM_PREFIXES = ('utm_',)
+TRACKING_PARAMS = {'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid', '_ga'}
+
+
+class NewsSourceError(Exception):
+    """Raised when a provider cannot return articles"""
+
+
+def normalize_article(raw: Dict, category: str = 'general') -> Dict:
+    """Convert a provider article into the common article schema.
+
+    Accepts both NewsData.io result keys (link, source_id, pubDate) and
+    already-normalized keys (url, source, published_at).
+    """
+    raw_category = raw.get('category')
+    if isinstance(raw_category, list):
+        raw_category = raw_category[0] if raw_category else None
+
+    article = {
+        'title': (raw.get('title') or '').strip(),
+        'description': (raw.get('description') or '').strip(),
+        'content': (raw.get('content') or '').strip(),
+        'source': raw.get('source') or raw.get('source_id') or 'Unknown',
+        'url': (raw.get('url') or raw.get('link') or '').strip(),
+        'published_at': raw.get('published_at') or raw.get('pubDate') or '',
+        'category': raw_category or category
+    }
+
+    # Limit content length for summarization
+    if len(article['content']) > MAX_CONTENT_LENGTH:
+        article['content'] = article['content'][:MAX_CONTENT_LENGTH] + '...'
+
+    return article
+
+
+def article_key(article: Dict) -> str:
+    """Key used to detect the same story coming from several providers"""
+    url = article.get('url', '').strip()
+    if url:
+        parsed = urlparse(url)
+        host = parsed.netloc.lower()
+        if host.startswith('www.'):
+            host = host[4:]
+        # Keep parameters that identify the article, drop tracking ones
+        query = sorted((name, value) for name, value in parse_qsl(parsed.query, keep_blank_values=True)
+                       if not name.lower().startswith(TRACKING_PARAM_PREFIXES)
+                       and name.lower() not in TRACKING_PARAMS)
+        key = f"{host}{parsed.path.rstrip('/')}"
+        return f"{key}?{urlencode(query)}" if query else key
+    return 'title:' + ' '.join(article.get('title', '').lower().split())
+
+
+def merge_articles(article_lists: List[List[Dict]], max_results: Optional[int] = None,
+                   exclude: Optional[Callable[[Dict], bool]] = None) -> List[Dict]:
+    """Merge provider results by URL, keeping the first provider's copy.
+
+    Articles matching exclude are dropped before the list is cut to max_results.
+    """
+    merged = []
+    seen = set()
+
+    for articles in article_lists:
+        for article in articles:
+            key = article_key(article)
+            if key in seen or (exclude and exclude(article)):
+                continue
+            seen.add(key)
+            merged.append(article)
+
+    return merged[:max_results] if max_results else merged
+
+
+class NewsSource:
+    """Base class for news providers"""
+    name = 'base'
+    # True when every category goes to the same endpoint, so one failed
+    # request says the others will fail too
+    probe_first = False
+
+    def __init__(self, timeout: float = PROVIDER_TIMEOUT):
+        self.timeout = timeout
+
+    def is_available(self) -> bool:
+        """Whether the provider is configured well enough to be queried"""
+        return True
+
+    def fetch(self, category: str, max_results: int = 5) -> List[Dict]:
+        """Return normalized articles for a category or raise NewsSourceError"""
+        raise NotImplementedError
+
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """GET through the endpoint's circuit breaker with an adaptive timeout"""
+        parsed = urlparse(url)
+        breaker = get_breaker(f"{parsed.netloc}{parsed.path}")
+        if not breaker.allow_request():
+            raise CircuitOpenError(f"{breaker.name} is down - circuit open")
+
+        timeout = min(self.timeout, breaker.timeout())
+        start = time.monotonic()
+        try:
+            response = requests.get(url, timeout=timeout, **kwargs)
+        except requests.exceptions.Timeout:
+            breaker.record_failure(latency=timeout)
+            raise
+        except requests.exceptions.RequestException:
+            breaker.record_failure()
+            raise
+
+        if response.status_code in (401, 403):
+            # Bad credentials won't fix themselves within a run
+            breaker.record_failure(permanent=True)
+        elif response.status_code == 429 or response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success(time.monotonic() - start)
+        return response
+
+
+class NewsDataSource(NewsSource):
+    """NewsData.io API provider"""
+    name = 'newsdata'
+    probe_first = True
+
+    def __init__(self, api_key: Optional[str] = None, base_url: str = NEWSDATA_BASE_URL,
+                 timeout: float = PROVIDER_TIMEOUT):
+        super().__init__(timeout)
+        self.api_key = api_key or NEWSDATA_API_KEY
+        self.base_url = base_url
+
+    def is_available(self) -> bool:
+        return bool(self.api_key) and not self.api_key.startswith('your_')
+
+    def fetch(self, category: str, max_results: int = 5) -> List[Dict]:
+        params = {
+            'apikey': self.api_key,
+            'category': category,
+            'language': 'en',
+            'size': min(max_results, NEWSDATA_MAX_PAGE_SIZE)
+        }
+
+        try:
+            response = self._get(self.base_url, params=params)
+        except requests.exceptions.RequestException as e:
+            raise NewsSourceError(f"Network error: {e}")
+        except CircuitOpenError as e:
+            raise NewsSourceError(str(e))
+
+        # Check for specific HTTP errors
+        if response.status_code == 401:
+            raise NewsSourceError("401 Unauthorized - Check API key")
+        elif response.status_code == 429:
+            raise NewsSourceError("Rate limit exceeded")
+        elif response.status_code != 200:
+            raise NewsSourceError(f"HTTP {response.status_code}")
+
+        try:
+            data = response.json()
+        except ValueError as e:
+            raise NewsSourceError(f"JSON error: {e}")
+
+        if data.get('status') != 'success':
+            raise NewsSourceError(f"API error: {data.get('message', 'Unknown error')}")
+
+        return [normalize_article(article, category)
+                for article in data.get('results', []) if article.get('title')]
+
+
+class RSSSource(NewsSource):
+    """RSS 2.0 and Atom feed provider"""
+    name = 'rss'
+
+    def __init__(self, feeds: Optional[Dict[str, List[str]]] = None, timeout: float = PROVIDER_TIMEOUT):
+        super().__init__(timeout)
+        self.feeds = feeds if feeds is not None else parse_feed_config(RSS_FEEDS)
+
+    def is_available(self) -> bool:
+        return bool(self.feeds)
+
+    def fetch(self, category: str, max_results: int = 5) -> List[Dict]:
+        feed_urls = self.feeds.get(category, [])
+        if not feed_urls:
+            return []
+
+        article_lists = {}
+        errors = []
+        # Feeds are fetched in parallel and must finish ahead of the
+        # aggregator's deadline so the ones that succeeded still count
+        executor = ThreadPoolExecutor(max_workers=len(feed_urls))
+
+        try:
+            futures = {executor.submit(self._fetch_feed, feed_url, category): feed_url
+                       for feed_url in feed_urls}
+            _, not_done = wait(futures, timeout=self.timeout * FEED_DEADLINE_FRACTION)
+
+            for future, feed_url in futures.items():
+                if future in not_done:
+                    errors.append(f"{feed_url}: timed out")
+                    continue
+                try:
+                    article_lists[feed_url] = future.result()
+                except (requests.exceptions.RequestException, CircuitOpenError, ET.ParseError) as e:
+                    errors.append(f"{feed_url}: {e}")
+        finally:
+            executor.shutdown(wait=False)
+
+        # Only fail when every feed for the category failed
+        if errors and not article_lists:
+            raise NewsSourceError('; '.join(errors))
+
+        return merge_articles([article_lists[url] for url in feed_urls if url in article_lists], max_results)
+
+    def _fetch_feed(self, feed_url: str, category: str) -> List[Dict]:
+        response = self._get(feed_url)
+        response.raise_for_status()
+        return self._parse_feed(response.content, feed_url, category)
+
+    def _parse_feed(self, xml_data: bytes, feed_url: str, category: str) -> List[Dict]:
+        """Parse RSS <item> or Atom <entry> elements into articles"""
+        root = ET.fromstring(xml_data)
+        feed_title = (root.findtext('channel/title') or root.findtext(f'{ATOM_NS}title')
+                      or urlparse(feed_url).netloc)
+        articles = []
+
+        for item in root.iter('item'):
+            articles.append(normalize_article({
+                'title': item.findtext('title'),
+                'description': _strip_html(item.findtext('description') or ''),
+                'url': item.findtext('link'),
+                'published_at': item.findtext('pubDate'),
+                'source': feed_title
+            }, category))
+
+        for entry in root.iter(f'{ATOM_NS}entry'):
+            link = entry.find(f'{ATOM_NS}link')
+            articles.append(normalize_article({
+                'title': entry.findtext(f'{ATOM_NS}title'),
+                'description': _strip_html(entry.findtext(f'{ATOM_NS}summary') or ''),
+                'content': _strip_html(entry.findtext(f'{ATOM_NS}content') or ''),
+                'url': link.get('href') if link is not None else '',
+                'published_at': entry.findtext(f'{ATOM_NS}published') or entry.findtext(f'{ATOM_NS}updated'),
+                'source': feed_title
+            }, category))
+
+        return [article for article in articles if article['title']]
+
+
+class LocalJSONSource(NewsSource):
+    """Provider reading JSON dumps named <category>.json from a directory"""
+    name = 'local'
+
+    def __init__(self, directory: str = LOCAL_NEWS_DIR, timeout: float = PROVIDER_TIMEOUT):
+        super().__init__(timeout)
+        self.directory = directory
+
+    def is_available(self) -> bool:
+        return os.path.isdir(self.directory)
+
+    def fetch(self, category: str, max_results: int = 5) -> List[Dict]:
+        path = os.path.join(self.directory, f"{category}.json")
+        if not os.path.exists(path):
+            return []
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise NewsSourceError(f"Could not read {path}: {e}")
+
+        # Accept a bare list or a saved API response
+        if isinstance(data, dict):
+            data = data.get('results') or data.get('articles') or []
+
+        articles = [normalize_article(article, category) for article in data if article.get('title')]
+        return articles[:max_results]
+
+
+def _strip_html(text: str) -> str:
+    """Remove markup from feed descriptions"""
+    return ' '.join(re.sub(r'<[^>]+>', ' ', text).split())
+
+
+def parse_feed_config(value: str) -> Dict[str, List[str]]:
+    """Parse "category=url,category=url" into a category -> feeds mapping"""
+    feeds = {}
+    for entry in value.split(','):
+        if '=' not in entry:
+            continue
+        category, url = entry.split('=', 1)
+        feeds.setdefault(category.strip(), []).append(url.strip())
+    return feeds
+
+
+SOURCE_TYPES = {
+    NewsDataSource.name: NewsDataSource,
+    RSSSource.name: RSSSource,
+    LocalJSONSource.name: LocalJSONSource
+}
+
+
+def build_sources(names: Optional[List[str]] = None, newsdata_api_key: Optional[str] = None) -> List[NewsSource]:
+    """Create the configured providers in priority order"""
+    sources = []
+
+    for name in names or NEWS_SOURCES:
+        if name not in SOURCE_TYPES:
+            print(f"⚠️  Unknown news source '{name}' - skipping")
+            continue
+
+        if name == NewsDataSource.name:
+            source = NewsDataSource(api_key=newsdata_api_key)
+        else:
+            source = SOURCE_TYPES[name]()
+
+        if not source.is_available():
+            print(f"⚠️  News source '{name}' is not configured - skipping")
+            continue
+        sources.append(source)
+
+    return sources
+
+
+class NewsAggregator:
+    """Queries all providers in parallel and merges their results"""
+
+    def __init__(self, sources: Optional[List[NewsSource]] = None,
+                 cache_file: Optional[str] = SOURCE_CACHE_FILE,
+                 cache_max_age: float = SOURCE_CACHE_MAX_AGE):
+        self.sources = sources if sources is not None else build_sources()
+        # Last good result per (provider, category) with its fetch time,
+        # served when a provider is down and the result is recent enough
+        self.cache_file = cache_file
+        self.cache_max_age = cache_max_age
+        self._cache: Dict[Tuple[str, str], Dict] = self._load_cache()
+        self._cache_changed = False
+        # The Streamlit app shares one aggregator between sessions
+        self._cache_lock = threading.Lock()
+
+    def fetch_categories(self, categories: List[str],
+                         max_results: int = 5, exclude: Optional[Callable[[Dict], bool]] = None
+                         ) -> Tuple[Dict[str, List[Dict]], Dict[str, List[str]]]:
+        """Fetch every category from every provider.
+
+        Returns (articles by category, error messages by category). A provider
+        that fails or exceeds its timeout only reduces coverage; its last good
+        result is reused when one is available. Providers with a single
+        endpoint send one probe request first and skip the other categories
+        if it fails. Articles matching exclude (e.g. already sent) are dropped
+        before each category is cut to max_results, and providers are asked
+        for extra articles to make up for them.
+        """
+        results = {category: [] for category in categories}
+        errors = {category: [] for category in categories}
+
+        if not categories:
+            return results, errors
+
+        if not self.sources:
+            for category in categories:
+                errors[category].append("No news sources configured")
+            return results, errors
+
+        fetch_size = max_results * EXCLUDE_OVERFETCH if exclude else max_results
+        # One worker per job so a slow provider can't queue healthy ones behind it
+        executor = ThreadPoolExecutor(max_workers=len(categories) * len(self.sources))
+        fetched = {category: {} for category in categories}
+        pending = {}
+        waiting_on_probe = {}
+
+        def submit(source, category):
+            # Each job's timeout starts when it is submitted, which is when it starts running
+            future = executor.submit(source.fetch, category, fetch_size)
+            pending[future] = (source, category, time.monotonic() + source.timeout)
+
+        try:
+            for source in self.sources:
+                if source.probe_first and len(categories) > 1:
+                    submit(source, categories[0])
+                    waiting_on_probe[source.name] = categories[1:]
+                else:
+                    for category in categories:
+                        submit(source, category)
+
+            while pending:
+                next_deadline = min(deadline for _, _, deadline in pending.values())
+                done, _ = wait(pending, timeout=max(next_deadline - time.monotonic(), 0),
+                               return_when=FIRST_COMPLETED)
+                now = time.monotonic()
+
+                for future, (source, category, deadline) in list(pending.items()):
+                    if future not in done and now < deadline:
+                        continue
+                    del pending[future]
+                    error = self._collect(future, source, category, fetched, errors)
+
+                    for sibling in waiting_on_probe.pop(source.name, []):
+                        if error is None:
+                            submit(source, sibling)
+                        else:
+                            self._use_cache(source, sibling, f"skipped, probe failed: {error}", fetched, errors)
+        finally:
+            # Don't block the digest on providers that are still running
+            executor.shutdown(wait=False)
+            save_breakers()
+            self._save_cache()
+
+        for category in categories:
+            # Merge in configured priority order, not completion order
+            results[category] = merge_articles(
+                [fetched[category][source.name] for source in self.sources if source.name in fetched[category]],
+                max_results,
+                exclude
+            )
+
+        return results, errors
+
+    def _collect(self, future, source: NewsSource, category: str,
+                 fetched: Dict[str, Dict[str, List[Dict]]], errors: Dict[str, List[str]]) -> Optional[str]:
+        """Record a finished or timed-out job; returns its error, if any"""
+        if not future.done():
+            error = f"timed out after {source.timeout:g}s"
+        else:
+            try:
+                articles = future.result()
+                with self._cache_lock:
+                    self._cache[(source.name, category)] = {'fetched_at': time.time(), 'articles': articles}
+                    self._cache_changed = True
+                fetched[category][source.name] = articles
+                return None
+            except (NewsSourceError, CircuitOpenError) as e:
+                error = str(e)
+            except Exception as e:
+                error = f"unexpected error: {e}"
+
+        self._use_cache(source, category, error, fetched, errors)
+        return error
+
+    def _use_cache(self, source: NewsSource, category: str, error: str,
+                   fetched: Dict[str, Dict[str, List[Dict]]], errors: Dict[str, List[str]]):
+        """Report a provider failure, serving its last good result if there is one"""
+        with self._cache_lock:
+            cached = self._cache.get((source.name, category))
+        if cached and cached['articles']:
+            age = time.time() - cached['fetched_at']
+            if age <= self.cache_max_age:
+                error += f" (using cached results from {age / 3600:.1f}h ago)"
+                fetched[category][source.name] = cached['articles']
+        errors[category].append(f"{source.name}: {error}")
+
+    def _load_cache(self) -> Dict[Tuple[str, str], Dict]:
+        if not self.cache_file:
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # Entries without a fetch time can't be aged, so they are dropped
+        return {tuple(key.split(':', 1)): entry for key, entry in data.items()
+                if isinstance(entry, dict) and 'fetched_at' in entry}
+
+    def _save_cache(self):
+        with self._cache_lock:
+            if not self.cache_file or not self._cache_changed:
+                return
+            snapshot = {f"{name}:{category}": entry for (name, category), entry in self._cache.items()}
+            self._cache_changed = False
+
+        try:
+            write_json_atomic(self.cache_file, snapshot)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"⚠️  Could not save cached news: {e}")
@@ -1,11 +1,31 @@
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+import requests
+from circuit_breaker import get_breaker, save_breakers
 from config import GEMINI_API_KEY
 from typing import List, Dict
 import re
+import time
+
+# Errors that mean Gemini is unreachable or refusing service. InvalidArgument
+# is included because it is what Gemini returns for a bad API key. Anything
+# else (e.g. a safety-blocked response) says nothing about its health
+GEMINI_OUTAGE_ERRORS = (
+    google_exceptions.ServerError,
+    google_exceptions.TooManyRequests,
+    google_exceptions.Unauthorized,
+    google_exceptions.Forbidden,
+    google_exceptions.InvalidArgument,
+    google_exceptions.RetryError,
+    requests.exceptions.RequestException,
+    ConnectionError,
+    TimeoutError
+)
 
 class ArticleSummarizer:
     def __init__(self):
         self.gemini_api_key = GEMINI_API_KEY
+        self.breaker = get_breaker('gemini')
         self.setup_gemini()
     
     def setup_gemini(self):
@@ -18,10 +38,18 @@ class ArticleSummarizer:
                     transport='rest'  # Use REST instead of grpc
                 )
                 
+                # Don't wait on list_models() while Gemini is known to be down
+                if not self.breaker.allow_request():
+                    print("⚡ Gemini circuit open - using simple summaries")
+                    self.gemini_available = False
+                    return
+                
                 # List available models to find the correct one
                 try:
+                    start = time.monotonic()
                     models = genai.list_models()
                     available_models = [model.name for model in models]
+                    self.breaker.record_success(time.monotonic() - start)
                     print(f"✅ Available models: {available_models}")
                     
                     # Use gemini-1.0-pro if available, otherwise try alternatives
@@ -37,7 +65,13 @@ class ArticleSummarizer:
                     self.gemini_available = True
                     print("✅ Gemini AI initialized successfully")
                     
+                except GEMINI_OUTAGE_ERRORS as e:
+                    self.breaker.record_failure()
+                    save_breakers()
+                    print(f"❌ Error listing models: {e}")
+                    self.gemini_available = False
                 except Exception as e:
+                    self.breaker.release_probe()
                     print(f"❌ Error listing models: {e}")
                     self.gemini_available = False
                     
@@ -49,7 +83,7 @@ class ArticleSummarizer:
             self.gemini_available = False
     
     def summarize_article(self, article: Dict) -> Dict:
-        """Summarize a single article"""
+        """Return a copy of the article with a summary added"""
         content_to_summarize = f"{article['title']}. {article.get('description', '')}. {article.get('content', '')}"
         
         if self.gemini_available:
@@ -57,11 +91,14 @@ class ArticleSummarizer:
         else:
             summary = self._simple_summarize(content_to_summarize)
         
-        article['summary'] = summary
-        return article
+        return {**article, 'summary': summary}
     
     def _summarize_with_gemini(self, text: str) -> str:
         """Summarize using Gemini AI"""
+        # Skip straight to the simple summary while Gemini is known to be down
+        if not self.breaker.allow_request():
+            return self._simple_summarize(text)
+        
         try:
             # Clean and truncate text if too long
             clean_text = self._clean_text(text[:4000])  # Limit to Gemini's input size
@@ -74,12 +111,26 @@ class ArticleSummarizer:
             Summary:
             """
             
+            start = time.monotonic()
             response = self.model.generate_content(prompt)
-            return response.text.strip()
+            self.breaker.record_success(time.monotonic() - start)
             
+        except GEMINI_OUTAGE_ERRORS as e:
+            self.breaker.record_failure()
+            print(f"❌ Gemini unavailable: {e}")
+            return self._simple_summarize(text)
         except Exception as e:
+            # Unknown error: not evidence either way, but free the probe slot
+            self.breaker.release_probe()
             print(f"❌ Gemini summarization error: {e}")
             return self._simple_summarize(text)
+        
+        try:
+            return response.text.strip()
+        except ValueError as e:
+            # Raised when the response was blocked by safety filters
+            print(f"⚠️  Gemini returned no summary: {e}")
+            return self._simple_summarize(text)
     
     def _simple_summarize(self, text: str, max_sentences: int = 2) -> str:
         """Simple summarization without external APIs"""
@@ -107,4 +158,5 @@ class ArticleSummarizer:
             summarized = self.summarize_article(article)
             summarized_articles.append(summarized)
         
+        save_breakers()
         return summarized_articles
\ No newline at end of file
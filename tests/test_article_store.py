@@ -0,0 +1,124 @@
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+from article_store import (
+    ArticleRecord, ArticleStore, UNKNOWN_PUBLISHED, parse_published, url_hash
+)
+
+
+def make_article(n, published_at='2024-01-15 10:00:00', **fields):
+    article = {
+        'title': f'Story {n}',
+        'description': f'Description {n} – ünïcode',
+        'summary': f'Summary {n}',
+        'source': 'test',
+        'url': f'https://example.com/story?id={n}',
+        'category': 'technology',
+        'published_at': published_at
+    }
+    article.update(fields)
+    return article
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ArticleStore(str(tmp_path))
+    yield store
+    store.close()
+
+
+def test_record_round_trip():
+    article = make_article(1)
+    record = ArticleRecord.from_dict(article)
+    assert record.to_dict() == article
+    assert record.url_hash == url_hash(article)
+    assert record.published == int(datetime(2024, 1, 15, 10, tzinfo=timezone.utc).timestamp())
+
+
+@pytest.mark.parametrize('value', [
+    '2024-01-15 10:00:00',
+    '2024-01-15T10:00:00Z',
+    'Mon, 15 Jan 2024 10:00:00 GMT'
+])
+def test_parse_published_formats(value):
+    assert parse_published(value) == int(datetime(2024, 1, 15, 10, tzinfo=timezone.utc).timestamp())
+
+
+def test_parse_published_unknown():
+    assert parse_published('') == UNKNOWN_PUBLISHED
+    assert parse_published('last tuesday') == UNKNOWN_PUBLISHED
+
+
+def test_append_and_lookup(store):
+    assert store.append_many([make_article(1), make_article(2)]) == 2
+    assert len(store) == 2
+    assert store.get('https://example.com/story?id=2').to_dict() == make_article(2)
+    assert make_article(1) in store
+    assert store.get('https://example.com/story?id=3') is None
+
+
+def test_duplicates_are_skipped(store):
+    store.append(make_article(1))
+    tracked = make_article(1, url='https://www.example.com/story?id=1&utm_source=mail')
+    assert store.append_many([tracked, make_article(2), make_article(2)]) == 1
+    assert len(store) == 2
+
+
+def test_reopen_reads_persisted_rows(tmp_path):
+    store = ArticleStore(str(tmp_path))
+    store.append_many([make_article(n) for n in range(3)])
+    store.close()
+
+    reopened = ArticleStore(str(tmp_path))
+    assert len(reopened) == 3
+    assert [record.title for record in reopened.scan()] == ['Story 0', 'Story 1', 'Story 2']
+    reopened.close()
+
+
+def test_scan_date_range(store):
+    store.append_many([
+        make_article(1, published_at='2024-01-01'),
+        make_article(2, published_at='2024-01-10'),
+        make_article(3, published_at='2024-01-20'),
+        make_article(4, published_at='')
+    ])
+    titles = [record.title for record in store.scan(datetime(2024, 1, 5), datetime(2024, 1, 20))]
+    assert titles == ['Story 2']
+    # Unknown dates only appear in scans without a start
+    assert [record.title for record in store.scan(end=datetime(2024, 1, 5))] == ['Story 1', 'Story 4']
+
+
+def test_append_during_scan(store):
+    store.append_many([make_article(n) for n in range(3)])
+    seen = []
+    for record in store.scan():
+        seen.append(record.title)
+        store.append(make_article(len(store) + 10))
+    assert seen == ['Story 0', 'Story 1', 'Story 2']
+    assert len(store) == 6
+
+
+def test_torn_write_is_dropped_on_open(tmp_path):
+    store = ArticleStore(str(tmp_path))
+    store.append_many([make_article(1), make_article(2)])
+    store.close()
+
+    # Simulate a crash after some columns of a third row were written
+    with open(os.path.join(str(tmp_path), 'length.col'), 'ab') as f:
+        f.write(b'\x00' * 4)
+    with open(os.path.join(str(tmp_path), 'offset.col'), 'ab') as f:
+        f.write(b'\x00' * 8)
+
+    store = ArticleStore(str(tmp_path))
+    assert len(store) == 2
+    for name in ('length', 'offset', 'published', 'url_hash'):
+        size = os.path.getsize(os.path.join(str(tmp_path), f'{name}.col'))
+        assert size == 2 * (4 if name == 'length' else 8)
+
+    # New rows stay aligned after the repair
+    store.append(make_article(3))
+    assert store.get('https://example.com/story?id=3').title == 'Story 3'
+    assert store.get('https://example.com/story?id=2').title == 'Story 2'
+    store.close()
@@ -0,0 +1,154 @@
+import time
+
+from circuit_breaker import CircuitBreaker, LatencyTracker
+
+
+def make_breaker(**kwargs):
+    kwargs.setdefault('failure_threshold', 2)
+    kwargs.setdefault('reset_timeout', 60)
+    return CircuitBreaker('test', **kwargs)
+
+
+def expire(breaker):
+    """Pretend the reset timeout has passed"""
+    breaker.opened_at = time.time() - breaker.reset_timeout - 1
+
+
+def test_opens_after_threshold_failures():
+    breaker = make_breaker()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_success_resets_failure_count():
+    breaker = make_breaker()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_permanent_failure_opens_immediately():
+    breaker = make_breaker(failure_threshold=5)
+    breaker.record_failure(permanent=True)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_half_open_allows_a_single_probe():
+    breaker = make_breaker()
+    breaker.record_failure(permanent=True)
+    expire(breaker)
+
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow_request()
+
+
+def test_successful_probe_closes_circuit():
+    breaker = make_breaker()
+    breaker.record_failure(permanent=True)
+    expire(breaker)
+    breaker.allow_request()
+
+    breaker.record_success(0.1)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
+    assert breaker.allow_request()
+
+
+def test_failed_probe_reopens_circuit():
+    breaker = make_breaker(failure_threshold=5)
+    breaker.record_failure(permanent=True)
+    expire(breaker)
+    breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_restore_round_trip():
+    breaker = make_breaker()
+    breaker.record_success(0.5)
+    breaker.record_failure(permanent=True)
+
+    restored = make_breaker()
+    restored.restore(breaker.to_dict())
+    assert restored.state == CircuitBreaker.OPEN
+    assert restored.opened_at == breaker.opened_at
+    assert restored.latency.to_list() == [0.5]
+    assert not restored.allow_request()
+
+
+def test_restore_treats_interrupted_probe_as_open():
+    breaker = make_breaker()
+    breaker.record_failure(permanent=True)
+    expire(breaker)
+    breaker.allow_request()
+
+    restored = make_breaker()
+    restored.restore(breaker.to_dict())
+    assert restored.state == CircuitBreaker.OPEN
+    # The reset timeout already passed, so a new probe may go out
+    assert restored.allow_request()
+    assert restored.state == CircuitBreaker.HALF_OPEN
+
+
+def test_latency_uses_max_timeout_until_enough_samples():
+    tracker = LatencyTracker(min_samples=3, min_timeout=1, max_timeout=10)
+    tracker.record(0.1)
+    tracker.record(0.1)
+    assert tracker.timeout() == 10
+
+
+def test_latency_timeout_is_percentile_times_multiplier():
+    tracker = LatencyTracker(min_samples=1, percentile=0.5, multiplier=2, min_timeout=1, max_timeout=10)
+    for seconds in (1.0, 2.0, 3.0):
+        tracker.record(seconds)
+    assert tracker.timeout() == 4.0
+
+
+def test_latency_timeout_is_clamped():
+    fast = LatencyTracker(min_samples=1, min_timeout=1, max_timeout=10)
+    fast.record(0.01)
+    assert fast.timeout() == 1
+
+    slow = LatencyTracker(min_samples=1, min_timeout=1, max_timeout=10)
+    slow.record(30)
+    assert slow.timeout() == 10
+
+
+def test_latency_window_drops_old_samples():
+    tracker = LatencyTracker(window=3, min_samples=1, percentile=1.0, multiplier=1,
+                             min_timeout=0, max_timeout=100)
+    for seconds in (50, 1, 1, 1):
+        tracker.record(seconds)
+    assert tracker.timeout() == 1
+
+
+def test_half_open_probe_gets_max_timeout():
+    breaker = make_breaker(latency=LatencyTracker(min_samples=1, min_timeout=1, max_timeout=10))
+    breaker.record_success(0.2)
+    assert breaker.timeout() == 1
+
+    breaker.record_failure(permanent=True)
+    expire(breaker)
+    breaker.allow_request()
+    assert breaker.timeout() == 10
+
+
+def test_timeouts_raise_the_adaptive_timeout():
+    tracker = LatencyTracker(window=10, min_samples=1, min_timeout=1, max_timeout=10)
+    breaker = make_breaker(latency=tracker)
+    for _ in range(10):
+        breaker.record_success(0.2)
+    assert breaker.timeout() == 1
+
+    for _ in range(5):
+        breaker.record_failure(latency=breaker.timeout())
+    assert breaker.timeout() > 1
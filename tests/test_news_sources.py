@@ -0,0 +1,219 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+import news_sources
+from news_sources import (
+    NewsAggregator, NewsSource, NewsSourceError, RSSSource, article_key,
+    merge_articles, normalize_article, parse_feed_config
+)
+
+
+@pytest.fixture(autouse=True)
+def no_saved_state(monkeypatch):
+    """Keep breaker state out of the working directory"""
+    monkeypatch.setattr(news_sources, 'save_breakers', lambda: None)
+
+
+def make_article(url, title='Story', category='technology'):
+    return normalize_article({'title': title, 'url': url}, category)
+
+
+class FakeSource(NewsSource):
+    """Provider returning canned articles, optionally slowly or with an error"""
+
+    def __init__(self, name, articles=None, delay=0.0, error=None, timeout=5.0, probe_first=False):
+        super().__init__(timeout)
+        self.name = name
+        self.articles = articles or {}
+        self.delay = delay
+        self.error = error
+        self.probe_first = probe_first
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def fetch(self, category, max_results=5):
+        with self._lock:
+            self.calls.append(category)
+        time.sleep(self.delay)
+        if self.error:
+            raise NewsSourceError(self.error)
+        return self.articles.get(category, [make_article(f'https://{self.name}.test/{category}')])
+
+
+def make_aggregator(*sources, **kwargs):
+    return NewsAggregator(list(sources), cache_file=None, **kwargs)
+
+
+@pytest.mark.parametrize('first, second', [
+    ('https://www.example.com/a/', 'https://example.com/a'),
+    ('https://example.com/a?b=2&a=1', 'https://EXAMPLE.com/a?a=1&b=2'),
+    ('https://example.com/a?id=1&utm_source=x&fbclid=y', 'https://example.com/a?id=1'),
+])
+def test_article_key_matches_same_story(first, second):
+    assert article_key({'url': first}) == article_key({'url': second})
+
+
+@pytest.mark.parametrize('first, second', [
+    ('https://example.com/story.php?id=1', 'https://example.com/story.php?id=2'),
+    ('https://newswww.example.com/a', 'https://news.example.com/a'),
+    ('https://example.com/Story', 'https://example.com/story'),
+])
+def test_article_key_keeps_distinct_stories(first, second):
+    assert article_key({'url': first}) != article_key({'url': second})
+
+
+def test_article_key_falls_back_to_title():
+    assert article_key({'url': '', 'title': ' Big  News '}) == article_key({'title': 'big news'})
+
+
+def test_merge_keeps_first_copy_and_limits():
+    first = [make_article('https://a.test/1', 'A1'), make_article('https://a.test/2', 'A2')]
+    second = [make_article('https://www.a.test/1/', 'B1'), make_article('https://b.test/3', 'B3')]
+    merged = merge_articles([first, second], max_results=2)
+    assert [article['title'] for article in merged] == ['A1', 'A2']
+    assert len(merge_articles([first, second])) == 3
+
+
+def test_merge_excludes_before_limiting():
+    articles = [make_article(f'https://a.test/{n}', f'A{n}') for n in range(5)]
+    merged = merge_articles([articles], max_results=2, exclude=lambda a: a['title'] in ('A0', 'A1'))
+    assert [article['title'] for article in merged] == ['A2', 'A3']
+
+
+def test_normalize_newsdata_result():
+    article = normalize_article({
+        'title': ' Title ', 'description': None, 'content': 'x' * 2000,
+        'source_id': 'bbc', 'link': 'https://bbc.test/1', 'pubDate': '2024-01-15 10:00:00',
+        'category': ['science']
+    }, 'technology')
+    assert article['title'] == 'Title'
+    assert article['description'] == ''
+    assert article['source'] == 'bbc'
+    assert article['url'] == 'https://bbc.test/1'
+    assert article['category'] == 'science'
+    assert len(article['content']) == news_sources.MAX_CONTENT_LENGTH + 3
+
+
+def test_parse_feed_config():
+    assert parse_feed_config('tech=https://a.test/rss?x=1, science=https://b.test,tech=https://c.test') == {
+        'tech': ['https://a.test/rss?x=1', 'https://c.test'],
+        'science': ['https://b.test']
+    }
+
+
+RSS = b'''<rss><channel><title>Feed</title>
+<item><title>One</title><link>https://rss.test/1</link>
+<description>&lt;p&gt;Hello &lt;b&gt;world&lt;/b&gt;&lt;/p&gt;</description>
+<pubDate>Mon, 15 Jan 2024 10:00:00 GMT</pubDate></item>
+<item><title></title><link>https://rss.test/untitled</link></item>
+</channel></rss>'''
+
+ATOM = b'''<feed xmlns="http://www.w3.org/2005/Atom"><title>Atom Feed</title>
+<entry><title>Two</title><link href="https://atom.test/2"/><summary>Short</summary>
+<updated>2024-01-15T10:00:00Z</updated></entry>
+</feed>'''
+
+
+def test_parse_rss():
+    articles = RSSSource(feeds={})._parse_feed(RSS, 'https://rss.test/feed', 'tech')
+    assert len(articles) == 1
+    assert articles[0]['title'] == 'One'
+    assert articles[0]['description'] == 'Hello world'
+    assert articles[0]['source'] == 'Feed'
+    assert articles[0]['published_at'] == 'Mon, 15 Jan 2024 10:00:00 GMT'
+    assert articles[0]['category'] == 'tech'
+
+
+def test_parse_atom():
+    articles = RSSSource(feeds={})._parse_feed(ATOM, 'https://atom.test/feed', 'tech')
+    assert [(a['title'], a['url'], a['source'], a['published_at']) for a in articles] == [
+        ('Two', 'https://atom.test/2', 'Atom Feed', '2024-01-15T10:00:00Z')
+    ]
+
+
+def test_rss_keeps_partial_results_when_a_feed_is_slow():
+    def fake_get(self, url, **kwargs):
+        time.sleep(2 if 'slow' in url else 0)
+        return mock.Mock(content=RSS, raise_for_status=lambda: None)
+
+    source = RSSSource(feeds={'tech': ['https://slow.test/a', 'https://fast.test/b']}, timeout=0.5)
+    with mock.patch.object(NewsSource, '_get', fake_get):
+        articles = source.fetch('tech')
+    assert [article['title'] for article in articles] == ['One']
+
+
+def test_rss_fails_when_every_feed_fails():
+    def fake_get(self, url, **kwargs):
+        raise news_sources.requests.exceptions.ConnectionError('down')
+
+    source = RSSSource(feeds={'tech': ['https://a.test', 'https://b.test']})
+    with mock.patch.object(NewsSource, '_get', fake_get):
+        with pytest.raises(NewsSourceError):
+            source.fetch('tech')
+
+
+def test_no_categories():
+    assert make_aggregator(FakeSource('a')).fetch_categories([]) == ({}, {})
+
+
+def test_no_sources():
+    results, errors = make_aggregator().fetch_categories(['tech'])
+    assert results == {'tech': []}
+    assert errors['tech'] == ['No news sources configured']
+
+
+def test_slow_provider_does_not_starve_fast_one():
+    categories = ['business', 'technology', 'science', 'health', 'entertainment']
+    slow = FakeSource('slow', delay=2, timeout=0.5)
+    fast = FakeSource('fast', delay=0.2, timeout=0.5)
+
+    start = time.monotonic()
+    results, errors = make_aggregator(slow, fast).fetch_categories(categories, 3)
+    assert time.monotonic() - start < 1.5
+
+    for category in categories:
+        assert [article['url'] for article in results[category]] == [f'https://fast.test/{category}']
+        assert errors[category] == ['slow: timed out after 0.5s']
+
+
+def test_results_merge_in_priority_order():
+    shared = 'https://shared.test/story'
+    slow_first = FakeSource('first', delay=0.3, articles={'tech': [make_article(shared, 'from first')]})
+    quick_second = FakeSource('second', articles={'tech': [make_article(shared, 'from second')]})
+    results, _ = make_aggregator(slow_first, quick_second).fetch_categories(['tech'])
+    assert [article['title'] for article in results['tech']] == ['from first']
+
+
+def test_probe_first_skips_siblings_after_failure():
+    source = FakeSource('api', error='HTTP 500', probe_first=True)
+    results, errors = make_aggregator(source).fetch_categories(['a', 'b', 'c'])
+    assert source.calls == ['a']
+    assert errors['a'] == ['api: HTTP 500']
+    assert errors['b'] == ['api: skipped, probe failed: HTTP 500']
+    assert results == {'a': [], 'b': [], 'c': []}
+
+
+def test_probe_first_fetches_siblings_after_success():
+    source = FakeSource('api', probe_first=True)
+    results, errors = make_aggregator(source).fetch_categories(['a', 'b', 'c'])
+    assert sorted(source.calls) == ['a', 'b', 'c']
+    assert all(results[category] for category in 'abc')
+    assert not any(errors.values())
+
+
+def test_cached_results_cover_failures_until_they_expire(tmp_path):
+    cache_file = str(tmp_path / 'cache.json')
+    NewsAggregator([FakeSource('api')], cache_file=cache_file).fetch_categories(['tech'])
+
+    results, errors = NewsAggregator([FakeSource('api', error='down')],
+                                     cache_file=cache_file).fetch_categories(['tech'])
+    assert results['tech'][0]['url'] == 'https://api.test/tech'
+    assert 'using cached results' in errors['tech'][0]
+
+    results, errors = NewsAggregator([FakeSource('api', error='down')], cache_file=cache_file,
+                                     cache_max_age=0).fetch_categories(['tech'])
+    assert results['tech'] == []
+    assert errors['tech'] == ['api: down']